@@ -0,0 +1,80 @@
+"""
+Shared library handles for the Python ctypes reference tests.
+
+Each loader is cached, so every test module gets the same already-opened
+handle instead of calling dlopen/LoadLibrary again in its setUpClass.
+"""
+
+import ctypes.util
+import functools
+import sys
+from contextlib import contextmanager
+from ctypes import CDLL
+
+
+def load_libc(use_errno=False):
+    """Return the platform C runtime (msvcrt / libSystem / libc)
+
+    use_errno stays False unless a test reads ctypes.get_errno(): with it
+    enabled ctypes swaps errno in and out around every call on the handle.
+    Tests that need errno get their own (also cached) handle.
+    """
+    # Normalized and passed positionally so every spelling of the same
+    # request hits one cache entry, i.e. one shared CDLL
+    return _load_libc(bool(use_errno))
+
+
+@functools.cache
+def _load_libc(use_errno):
+    if sys.platform == "win32":
+        return CDLL("msvcrt", use_errno=use_errno)
+    if sys.platform == "darwin":
+        return CDLL("libSystem.B.dylib", use_errno=use_errno)
+    try:
+        return CDLL("libc.so.6", use_errno=use_errno)
+    except OSError:
+        pass
+    # Non-glibc systems (musl, BSDs): ask the linker; failing that,
+    # CDLL(None) resolves symbols from the already-linked process
+    try:
+        return CDLL(ctypes.util.find_library("c"), use_errno=use_errno)
+    except OSError:
+        return CDLL(None, use_errno=use_errno)
+
+
+@functools.cache
+def load_kernel32():
+    """Return kernel32 on Windows, None elsewhere"""
+    if sys.platform != "win32":
+        return None
+    from ctypes import WinDLL
+
+    return WinDLL("kernel32")
+
+
+def bind(fn, argtypes, restype):
+    """Set fn's prototype once and return fn
+
+    The library handles are shared by every test module, and so are the
+    function objects looked up on them: a prototype must be identical
+    everywhere the function is bound. Rebinding to a different prototype
+    raises instead of silently overwriting it; a test that needs another
+    prototype binds a private copy obtained with lib["name"].
+    """
+    argtypes = tuple(argtypes)
+    if fn.argtypes is None:
+        fn.argtypes = argtypes
+        fn.restype = restype
+    elif fn.argtypes != argtypes or fn.restype is not restype:
+        raise ValueError(f"{fn.__name__} is already bound to a different prototype")
+    return fn
+
+
+@contextmanager
+def errcheck_installed(fn, errcheck):
+    """Install errcheck on fn for the duration of the block, always removing it"""
+    fn.errcheck = errcheck
+    try:
+        yield fn
+    finally:
+        del fn.errcheck
@@ -4,7 +4,7 @@ Tests array creation, indexing, iteration, in structs, in functions
 """
 
 import unittest
-from ctypes import c_int32, c_uint8, c_double, c_float, c_char, sizeof, Structure
+from ctypes import c_int32, c_uint8, c_double, c_float, c_char, sizeof, Structure, memmove
 
 class TestArrays(unittest.TestCase):
     def test_array_creation(self):
@@ -70,8 +70,10 @@ class TestArrays(unittest.TestCase):
         IntArray5 = c_int32 * 5
         arr = IntArray5(1, 2, 3, 4, 5)
         
-        values = list(arr)
+        # Full slice reads every element in one C-level call
+        values = arr[:]
         self.assertEqual(values, [1, 2, 3, 4, 5])
+        self.assertEqual(list(arr), values)
     
     def test_arrays_in_structs(self):
         """Test array fields in structs"""
@@ -140,8 +142,7 @@ class TestArrays(unittest.TestCase):
         CharArray = c_char * 100
         arr = CharArray()
         s = b'Hello, World!'
-        for i, c in enumerate(s):
-            arr[i] = c
+        memmove(arr, s, len(s))
         
         # Should contain ASCII values
         self.assertEqual(arr[0], b'H')
@@ -4,9 +4,7 @@ Tests callback functionality with qsort example
 """
 
 import unittest
-import sys
 from ctypes import (
-    CDLL,
     c_int,
     c_size_t,
     c_void_p,
@@ -14,21 +12,22 @@ from ctypes import (
     c_int32,
     sizeof,
     create_string_buffer,
-    cast,
     POINTER,
     c_float,
 )
 
+from _libs import load_libc
+
+# Callback prototypes shared by all tests
+INT_CMPFUNC = CFUNCTYPE(c_int, POINTER(c_int), POINTER(c_int))
+FLOAT_CMPFUNC = CFUNCTYPE(c_int, POINTER(c_float), POINTER(c_float))
+VOID_CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
+
 
 class TestCallbacks(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        if sys.platform == "win32":
-            cls.libc = CDLL("msvcrt")
-        elif sys.platform == "darwin":
-            cls.libc = CDLL("libSystem.B.dylib")
-        else:
-            cls.libc = CDLL("libc.so.6")
+        cls.libc = load_libc()
 
     def test_qsort_callback(self):
         """Test qsort with integer comparison callback"""
@@ -36,16 +35,12 @@ class TestCallbacks(unittest.TestCase):
         IntArray5 = c_int * 5
         arr = IntArray5(5, 2, 8, 1, 9)
 
-        # Define callback function type
-        CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
-
+        # ctypes converts the callback args to int*
         def compare(a, b):
-            a_val = cast(a, POINTER(c_int)).contents.value
-            b_val = cast(b, POINTER(c_int)).contents.value
-            return a_val - b_val
+            return a[0] - b[0]
 
         # Create callback
-        cmp_callback = CMPFUNC(compare)
+        cmp_callback = INT_CMPFUNC(compare)
 
         # Call qsort
         self.libc.qsort(arr, 5, sizeof(c_int), cmp_callback)
@@ -61,16 +56,12 @@ class TestCallbacks(unittest.TestCase):
         IntArray4 = c_int * 4
         arr = IntArray4(3, 1, 4, 2)
 
-        # Define callback function type
-        CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
-
+        # ctypes converts the callback args to int*
         def compare_reverse(a, b):
-            a_val = cast(a, POINTER(c_int)).contents.value
-            b_val = cast(b, POINTER(c_int)).contents.value
-            return b_val - a_val  # Reverse order
+            return b[0] - a[0]  # Reverse order
 
         # Create callback
-        cmp_callback = CMPFUNC(compare_reverse)
+        cmp_callback = INT_CMPFUNC(compare_reverse)
 
         # Call qsort
         self.libc.qsort(arr, 4, sizeof(c_int), cmp_callback)
@@ -86,21 +77,14 @@ class TestCallbacks(unittest.TestCase):
         FloatArray3 = c_float * 3
         arr = FloatArray3(3.14, 1.41, 2.71)
 
-        # Define callback function type
-        CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
-
+        # ctypes converts the callback args to float*
         def compare_float(a, b):
-            a_val = cast(a, POINTER(c_float)).contents.value
-            b_val = cast(b, POINTER(c_float)).contents.value
-            if a_val < b_val:
-                return -1
-            elif a_val > b_val:
-                return 1
-            else:
-                return 0
+            a_val = a[0]
+            b_val = b[0]
+            return (a_val > b_val) - (a_val < b_val)
 
         # Create callback
-        cmp_callback = CMPFUNC(compare_float)
+        cmp_callback = FLOAT_CMPFUNC(compare_float)
 
         # Call qsort
         self.libc.qsort(arr, 3, sizeof(c_float), cmp_callback)
@@ -118,12 +102,10 @@ class TestCallbacks(unittest.TestCase):
 
         # This would be the Python way, but callbacks are created per use
         # In Python, callbacks are created when defining function types
-        CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
-
         def compare(a, b):
             return 0
 
-        callback = CMPFUNC(compare)
+        callback = VOID_CMPFUNC(compare)
 
         # In Python, callbacks don't have a direct "pointer" property
         # but they can be used directly as function pointers
@@ -2,11 +2,50 @@
 Test errcheck - Python ctypes error handling reference
 """
 
+import errno
+import functools
 import unittest
 import platform
 import ctypes
 from ctypes import c_size_t, c_char_p, c_int, c_void_p, POINTER
 
+from _libs import bind, errcheck_installed, load_libc, load_kernel32
+
+
+Buf10 = ctypes.c_char * 10
+
+# strlen payloads, pre-wrapped so the c_char_p argtype passes them through as-is
+HELLO = c_char_p(b"hello")
+HI = c_char_p(b"hi")
+LONG_STR = c_char_p(b"this is a very long string")
+
+
+def _record_errcheck(result, func, args):
+    """errcheck that records its calls and passes the result through"""
+    _record_errcheck.calls += 1
+    _record_errcheck.last = (result, func, args)
+    return result
+
+
+@functools.cache
+def _scale(k):
+    """errcheck multiplying the result by k (one shared callable per k)"""
+
+    def errcheck(result, func, args):
+        return result * k
+
+    return errcheck
+
+
+@functools.cache
+def _offset(k):
+    """errcheck adding k to the result (one shared callable per k)"""
+
+    def errcheck(result, func, args):
+        return result + k
+
+    return errcheck
+
 
 class TestErrcheck(unittest.TestCase):
     """Test errcheck functionality (Python ctypes compatible)"""
@@ -14,128 +53,93 @@ class TestErrcheck(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Load libraries once for all tests"""
-        if platform.system() == "Windows":
-            cls.libc = ctypes.CDLL("msvcrt.dll")
-            cls.kernel32 = ctypes.WinDLL("kernel32.dll")
-        elif platform.system() == "Darwin":
-            cls.libc = ctypes.CDLL("libSystem.B.dylib")
-            cls.kernel32 = None
-        else:
-            cls.libc = ctypes.CDLL("libc.so.6")
-            cls.kernel32 = None
+        cls.libc = load_libc()
+        cls.kernel32 = load_kernel32()
+        # memcpy source/destination, cleared with memset before each use
+        cls.src10 = Buf10()
+        cls.dst10 = Buf10()
+
+    def setUp(self):
+        _record_errcheck.calls = 0
+        _record_errcheck.last = None
 
     def test_basic_errcheck(self):
         """Test basic errcheck functionality"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
-
-        errcheck_called = [False]
-        received_result = [None]
-        received_args = [None]
-
-        def my_errcheck(result, func, args):
-            errcheck_called[0] = True
-            received_result[0] = result
-            received_args[0] = args
-            return result
-
-        strlen.errcheck = my_errcheck
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
-        result = strlen(b"hello")
+        with errcheck_installed(strlen, _record_errcheck):
+            result = strlen(HELLO)
 
-        self.assertTrue(errcheck_called[0], "errcheck should be called")
-        self.assertEqual(result, 5)
-        self.assertEqual(received_result[0], 5)
-        self.assertIsInstance(received_args[0], tuple)
-        self.assertEqual(len(received_args[0]), 1)
-
-        # Cleanup
-        del strlen.errcheck
+            self.assertEqual(_record_errcheck.calls, 1, "errcheck should be called")
+            received_result, _, received_args = _record_errcheck.last
+            self.assertEqual(result, 5)
+            self.assertEqual(received_result, 5)
+            self.assertIsInstance(received_args, tuple)
+            self.assertEqual(len(received_args), 1)
 
     def test_modify_return_value(self):
         """Test errcheck modifying return value"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
-
-        def double_errcheck(result, func, args):
-            return result * 2
-
-        strlen.errcheck = double_errcheck
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
-        result = strlen(b"hello")
-        self.assertEqual(result, 10)  # 5 * 2
-
-        # Cleanup
-        del strlen.errcheck
+        with errcheck_installed(strlen, _scale(2)):
+            result = strlen(HELLO)
+            self.assertEqual(result, 10)  # 5 * 2
 
     def test_errcheck_throws(self):
         """Test errcheck throwing exceptions"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         def validate_errcheck(result, func, args):
             if result > 10:
                 raise ValueError("String too long!")
             return result
 
-        strlen.errcheck = validate_errcheck
-
-        # Should pass
-        self.assertEqual(strlen(b"hello"), 5)
+        with errcheck_installed(strlen, validate_errcheck):
+            # Should pass
+            self.assertEqual(strlen(HELLO), 5)
 
-        # Should throw
-        with self.assertRaises(ValueError) as ctx:
-            strlen(b"this is a very long string")
-        self.assertIn("String too long!", str(ctx.exception))
-
-        # Cleanup
-        del strlen.errcheck
+            # Should throw
+            with self.assertRaises(ValueError) as ctx:
+                strlen(LONG_STR)
+            self.assertIn("String too long!", str(ctx.exception))
 
     def test_clear_errcheck(self):
         """Test clearing errcheck"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
-        strlen.errcheck = lambda r, f, a: r * 2
-        self.assertEqual(strlen(b"hi"), 4)  # 2 * 2
+        strlen.errcheck = _scale(2)
+        # Clear the shared strlen even if an assertion fails first
+        self.addCleanup(delattr, strlen, "errcheck")
+        self.assertEqual(strlen(HI), 4)  # 2 * 2
 
         # Clear errcheck by deleting attribute
         del strlen.errcheck
-        self.assertEqual(strlen(b"hi"), 2)  # Original value
+        self.assertEqual(strlen(HI), 2)  # Original value
 
     @unittest.skipIf(platform.system() == "Windows", "Unix-specific test")
     def test_errno_pattern(self):
         """Test errno pattern (POSIX)"""
-        open_func = self.libc.open
-        open_func.argtypes = [c_char_p, c_int]
-        open_func.restype = c_int
+        # ctypes.get_errno() only sees errno on a use_errno=True handle
+        open_func = bind(load_libc(use_errno=True).open, (c_char_p, c_int), c_int)
 
         def check_errno(result, func, args):
             if result == -1:
-                errno = ctypes.get_errno()
-                raise OSError(errno, f"open({args[0]}) failed with errno {errno}")
+                err = ctypes.get_errno()
+                raise OSError(err, f"open({args[0]}) failed with errno {err}")
             return result
 
-        open_func.errcheck = check_errno
-
-        # Non-existent file should throw
-        with self.assertRaises(OSError) as ctx:
-            open_func(b"/path/that/does/not/exist/test.txt", 0)
-        self.assertIsNotNone(ctx.exception.errno)
-
-        # Cleanup
-        del open_func.errcheck
+        with errcheck_installed(open_func, check_errno):
+            # Non-existent file should throw
+            with self.assertRaises(OSError) as ctx:
+                open_func(b"/path/that/does/not/exist/test.txt", 0)
+            self.assertEqual(ctx.exception.errno, errno.ENOENT)
 
     @unittest.skipIf(platform.system() != "Windows", "Windows-specific test")
     def test_winerror_pattern(self):
         """Test WinError pattern (Windows)"""
-        DeleteFileW = self.kernel32.DeleteFileW
-        DeleteFileW.argtypes = [ctypes.c_wchar_p]
-        DeleteFileW.restype = ctypes.c_bool
+        DeleteFileW = bind(
+            self.kernel32.DeleteFileW, (ctypes.c_wchar_p,), ctypes.c_bool
+        )
 
         # Set last error before calling
         self.kernel32.SetLastError(0)
@@ -147,116 +151,79 @@ class TestErrcheck(unittest.TestCase):
                     raise ctypes.WinError(winerror)
             return result
 
-        DeleteFileW.errcheck = check_winerror
-
-        # Non-existent file should throw
-        with self.assertRaises(OSError) as ctx:
-            DeleteFileW("Z:\\file_that_does_not_exist_xyz123.txt")
-        # WinError throws OSError with winerror attribute
-        self.assertTrue(
-            hasattr(ctx.exception, "winerror") or ctx.exception.errno is not None
-        )
-
-        # Cleanup
-        del DeleteFileW.errcheck
+        with errcheck_installed(DeleteFileW, check_winerror):
+            # Non-existent file should throw
+            with self.assertRaises(OSError) as ctx:
+                DeleteFileW("Z:\\file_that_does_not_exist_xyz123.txt")
+            # WinError throws OSError with winerror attribute
+            self.assertTrue(
+                hasattr(ctx.exception, "winerror") or ctx.exception.errno is not None
+            )
 
     def test_pointer_validation(self):
         """Test pointer validation with errcheck"""
-        malloc = self.libc.malloc
-        malloc.argtypes = [c_size_t]
-        malloc.restype = c_void_p
+        malloc = bind(self.libc.malloc, (c_size_t,), c_void_p)
 
         def check_null(result, func, args):
             if result is None or result == 0:
                 raise MemoryError(f"malloc({args[0]}) returned NULL")
             return result
 
-        malloc.errcheck = check_null
-
-        # Normal allocation should work
-        ptr = malloc(100)
-        self.assertNotEqual(ptr, 0)
+        with errcheck_installed(malloc, check_null):
+            # Normal allocation should work
+            ptr = malloc(100)
+            self.assertNotEqual(ptr, 0)
 
         # Cleanup
-        free = self.libc.free
-        free.argtypes = [c_void_p]
+        free = bind(self.libc.free, (c_void_p,), None)
         free(ptr)
-        del malloc.errcheck
 
     def test_errcheck_parameters(self):
-        """Test errcheck receives correct parameters"""
-        abs_func = self.libc.abs
-        abs_func.argtypes = [c_int]
-        abs_func.restype = c_int
-
-        captured = {}
-
-        def capture_errcheck(result, func, args):
-            captured["result"] = result
-            captured["func"] = func
-            captured["args"] = args
-            return result
-
-        abs_func.errcheck = capture_errcheck
-
-        result = abs_func(-42)
-
-        self.assertEqual(result, 42)
-        self.assertEqual(captured["result"], 42)
-        self.assertIsNotNone(captured["func"])
-        self.assertIsInstance(captured["args"], tuple)
-        self.assertEqual(len(captured["args"]), 1)
-        self.assertEqual(captured["args"][0], -42)
-
-        # Cleanup
-        del abs_func.errcheck
-
-    def test_multiple_arguments(self):
-        """Test errcheck with multiple arguments"""
-        memcpy = self.libc.memcpy
-        memcpy.argtypes = [c_void_p, c_void_p, c_size_t]
-        memcpy.restype = c_void_p
-
-        arg_count = [0]
-
-        def count_args_errcheck(result, func, args):
-            arg_count[0] = len(args)
-            return result
-
-        memcpy.errcheck = count_args_errcheck
-
-        src = ctypes.create_string_buffer(10)
-        dst = ctypes.create_string_buffer(10)
-        memcpy(dst, src, 10)
-
-        self.assertEqual(arg_count[0], 3)
-
-        # Cleanup
-        del memcpy.errcheck
+        """Test errcheck receives correct parameters (single and multiple arguments)"""
+        abs_func = bind(self.libc.abs, (c_int,), c_int)
+        memcpy = bind(self.libc.memcpy, (c_void_p, c_void_p, c_size_t), c_void_p)
+
+        src = self.src10
+        dst = self.dst10
+        ctypes.memset(src, 0, ctypes.sizeof(src))
+        ctypes.memset(dst, 0, ctypes.sizeof(dst))
+
+        # (name, function, call arguments, expected result)
+        cases = [
+            ("abs", abs_func, (-42,), 42),
+            ("memcpy", memcpy, (dst, src, 10), ctypes.addressof(dst)),
+        ]
+        for name, func, args, expected in cases:
+            with self.subTest(func=name), errcheck_installed(func, _record_errcheck):
+                result = func(*args)
+
+                captured_result, captured_func, captured_args = _record_errcheck.last
+                self.assertEqual(result, expected)
+                self.assertEqual(captured_result, expected)
+                self.assertIs(captured_func, func)
+                self.assertIsInstance(captured_args, tuple)
+                self.assertEqual(captured_args, args)
 
     def test_errcheck_chaining(self):
         """Test changing errcheck multiple times"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         # First errcheck
-        strlen.errcheck = lambda r, f, a: r + 1
-        self.assertEqual(strlen(b"hi"), 3)  # 2 + 1
+        strlen.errcheck = _offset(1)
+        self.addCleanup(delattr, strlen, "errcheck")
+        self.assertEqual(strlen(HI), 3)  # 2 + 1
 
         # Change errcheck
-        strlen.errcheck = lambda r, f, a: r * 3
-        self.assertEqual(strlen(b"hi"), 6)  # 2 * 3
+        strlen.errcheck = _scale(3)
+        self.assertEqual(strlen(HI), 6)  # 2 * 3
 
         # Remove by deleting
         del strlen.errcheck
-        self.assertEqual(strlen(b"hi"), 2)  # Original
+        self.assertEqual(strlen(HI), 2)  # Original
 
     def test_python_ctypes_compatibility(self):
         """Test that behavior matches Python ctypes exactly"""
-        abs_func = self.libc.abs
-        abs_func.argtypes = [c_int]
-        abs_func.restype = c_int
+        abs_func = bind(self.libc.abs, (c_int,), c_int)
 
         # Standard Python ctypes pattern
         def errcheck(result, func, args):
@@ -265,18 +232,14 @@ class TestErrcheck(unittest.TestCase):
                 raise err
             return result
 
-        abs_func.errcheck = errcheck
+        with errcheck_installed(abs_func, errcheck):
+            # Should not throw
+            self.assertEqual(abs_func(-5), 5)
 
-        # Should not throw
-        self.assertEqual(abs_func(-5), 5)
-
-        # Should throw
-        with self.assertRaises(OSError) as ctx:
-            abs_func(0)
-        self.assertEqual(ctx.exception.errno, 42)
-
-        # Cleanup
-        del abs_func.errcheck
+            # Should throw
+            with self.assertRaises(OSError) as ctx:
+                abs_func(0)
+            self.assertEqual(ctx.exception.errno, 42)
 
 
 if __name__ == "__main__":
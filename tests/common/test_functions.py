@@ -3,42 +3,65 @@ Test Functions and Callbacks - Cross Platform
 Tests function calls, variadic functions, callbacks, errcheck
 """
 
+import struct
 import unittest
 import sys
 from ctypes import (
-    CDLL,
     c_int,
     c_size_t,
     c_char_p,
     c_void_p,
     CFUNCTYPE,
     c_int32,
+    c_char,
     sizeof,
     byref,
     addressof,
     create_string_buffer,
     create_unicode_buffer,
-    cast,
-    POINTER,
     c_double,
+    memset,
+    memmove,
+    string_at,
 )
 
+from _libs import bind, errcheck_installed, load_libc
+
+# Output buffer shared by the sprintf calls, cleared with memset before reuse
+SPRINTF_BUF = create_string_buffer(256)
+
+# sprintf format strings, pre-wrapped for the fixed c_char_p parameter
+FMT_HELLO = c_char_p(b"Hello %s!")
+FMT_INT_AND_STRING = c_char_p(b"Number: %d, String: %s")
+FMT_SUM = c_char_p(b"%d + %d = %d")
+FMT_PI = c_char_p(b"Pi is approximately %.2f")
+
+Buf10 = c_char * 10
+
+# qsort input, packed once at import and copied into a fresh array per run
+IntArray5 = c_int32 * 5
+QSORT_INPUT = struct.pack("=5i", 5, 2, 8, 1, 9)
+
+
+def _int32_compare(a, b):
+    """qsort comparator for int32 elements (reads straight from the raw addresses)"""
+    return c_int32.from_address(a).value - c_int32.from_address(b).value
+
 
 class TestFunctionsAndCallbacks(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        if sys.platform == "win32":
-            cls.libc = CDLL("msvcrt")
-        elif sys.platform == "darwin":
-            cls.libc = CDLL("libSystem.B.dylib")
-        else:
-            cls.libc = CDLL("libc.so.6")
+        cls.libc = load_libc()
+        # memcpy source/destination, cleared with memset before each use
+        cls.src10 = Buf10()
+        cls.dst10 = Buf10()
+        # Comparison callback built once and shared by the qsort tests
+        cls.CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
+        cls.int32_compare_cb = cls.CMPFUNC(_int32_compare)
 
     def test_abs_function(self):
         """Test abs() function"""
-        abs_func = self.libc.abs
-        abs_func.argtypes = [c_int32]
-        abs_func.restype = c_int32
+        abs_func = bind(self.libc.abs, (c_int32,), c_int32)
 
         self.assertEqual(abs_func(-42), 42)
         self.assertEqual(abs_func(42), 42)
@@ -46,9 +69,7 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
 
     def test_strlen_function(self):
         """Test strlen() function"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         self.assertEqual(strlen(b"hello"), 5)
         self.assertEqual(strlen(b"world!"), 6)
@@ -56,29 +77,25 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
 
     def test_memcpy_function(self):
         """Test memcpy() with multiple arguments"""
-        memcpy = self.libc.memcpy
-        memcpy.argtypes = [c_void_p, c_void_p, c_size_t]
-        memcpy.restype = c_void_p
+        memcpy = bind(self.libc.memcpy, (c_void_p, c_void_p, c_size_t), c_void_p)
 
-        src = create_string_buffer(10)
-        dst = create_string_buffer(10)
+        src = self.src10
+        dst = self.dst10
+        memset(src, 0, sizeof(src))
+        memset(dst, 0, sizeof(dst))
 
         # Fill source with pattern
-        for i in range(10):
-            src[i] = i * 10
+        memmove(src, bytes(range(0, 100, 10)), 10)
 
         # Copy
         memcpy(dst, src, 10)
 
         # Verify
-        for i in range(10):
-            self.assertEqual(dst[i], src[i])
+        self.assertEqual(bytes(dst), bytes(src))
 
     def test_errcheck_called(self):
         """Test errcheck callback is called"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         errcheck_called = []
         received_result = []
@@ -88,9 +105,8 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
             received_result.append(result)
             return result
 
-        strlen.errcheck = check
-
-        result = strlen(b"hello")
+        with errcheck_installed(strlen, check):
+            result = strlen(b"hello")
 
         self.assertTrue(errcheck_called)
         self.assertEqual(result, 5)
@@ -98,43 +114,35 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
 
     def test_errcheck_modify_return(self):
         """Test errcheck can modify return value"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         def double_result(result, func, args):
             return result * 2
 
-        strlen.errcheck = double_result
-
-        result = strlen(b"hello")
+        with errcheck_installed(strlen, double_result):
+            result = strlen(b"hello")
         self.assertEqual(result, 10)  # 5 * 2
 
     def test_errcheck_throw_exception(self):
         """Test errcheck can throw exceptions"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         def check_empty(result, func, args):
             if result == 0:
                 raise ValueError("String is empty!")
             return result
 
-        strlen.errcheck = check_empty
-
-        # Non-empty string should work
-        self.assertEqual(strlen(b"hello"), 5)
+        with errcheck_installed(strlen, check_empty):
+            # Non-empty string should work
+            self.assertEqual(strlen(b"hello"), 5)
 
-        # Empty string should throw
-        with self.assertRaises(ValueError):
-            strlen(b"")
+            # Empty string should throw
+            with self.assertRaises(ValueError):
+                strlen(b"")
 
     def test_errcheck_clear(self):
         """Test clearing errcheck with None"""
-        strlen = self.libc.strlen
-        strlen.argtypes = [c_char_p]
-        strlen.restype = c_size_t
+        strlen = bind(self.libc.strlen, (c_char_p,), c_size_t)
 
         call_count = []
 
@@ -143,6 +151,8 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
             return result
 
         strlen.errcheck = counter
+        # Clear the shared strlen even if an assertion fails first
+        self.addCleanup(delattr, strlen, "errcheck")
 
         strlen(b"hello")
         self.assertEqual(len(call_count), 1)
@@ -155,29 +165,17 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
     @unittest.skipUnless(sys.platform == "win32", "Windows only")
     def test_callback_with_qsort(self):
         """Test create and use callback with qsort"""
-        qsort = self.libc.qsort
-        qsort.argtypes = [c_void_p, c_size_t, c_size_t, c_void_p]
-        qsort.restype = None
-
-        # Create comparison function
-        CMPFUNC = CFUNCTYPE(c_int, c_void_p, c_void_p)
-
-        def compare(a, b):
-            val_a = cast(a, POINTER(c_int32)).contents.value
-            val_b = cast(b, POINTER(c_int32)).contents.value
-            return val_a - val_b
-
-        compare_cb = CMPFUNC(compare)
+        qsort = bind(self.libc.qsort, (c_void_p, c_size_t, c_size_t, c_void_p), None)
 
         # Create array to sort
-        IntArray5 = c_int32 * 5
-        arr = IntArray5(5, 2, 8, 1, 9)
+        arr = IntArray5()
+        memmove(arr, QSORT_INPUT, sizeof(arr))
 
         # Sort
-        qsort(arr, 5, sizeof(c_int32), compare_cb)
+        qsort(arr, 5, sizeof(c_int32), self.int32_compare_cb)
 
-        # Verify sorted
-        self.assertEqual(list(arr), [1, 2, 5, 8, 9])
+        # Verify sorted (compare the raw buffer in one go)
+        self.assertEqual(bytes(arr), struct.pack("=5i", 1, 2, 5, 8, 9))
 
     def test_callback_signatures(self):
         """Test callbacks with different signatures"""
@@ -196,43 +194,40 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
     )
     def test_variadic_functions(self):
         """Test functions with variable arguments (sprintf)"""
-        sprintf = self.libc.sprintf
-        sprintf.argtypes = [c_char_p, c_char_p]  # Fixed args only
-        sprintf.restype = c_int32
+        sprintf = bind(self.libc.sprintf, (c_char_p, c_char_p), c_int32)  # Fixed args only
 
-        # Create buffer for output
-        buf = create_string_buffer(256)
+        buf = SPRINTF_BUF
 
         # Test variadic calls with different argument patterns
         # Python ctypes auto-detects variadic arguments!
-        written = sprintf(buf, b"Hello %s!", b"World")
+        memset(buf, 0, sizeof(buf))
+        written = sprintf(buf, FMT_HELLO, b"World")
         self.assertGreater(written, 0)
-        self.assertEqual(buf.value, b"Hello World!")
+        self.assertEqual(string_at(buf, written), b"Hello World!")
 
         # Different pattern: int and string
-        written = sprintf(buf, b"Number: %d, String: %s", 42, b"test")
+        memset(buf, 0, sizeof(buf))
+        written = sprintf(buf, FMT_INT_AND_STRING, 42, b"test")
         self.assertGreater(written, 0)
-        self.assertEqual(buf.value, b"Number: 42, String: test")
+        self.assertEqual(string_at(buf, written), b"Number: 42, String: test")
 
         # Multiple numbers
-        written = sprintf(buf, b"%d + %d = %d", 10, 20, 30)
+        memset(buf, 0, sizeof(buf))
+        written = sprintf(buf, FMT_SUM, 10, 20, 30)
         self.assertGreater(written, 0)
-        self.assertEqual(buf.value, b"10 + 20 = 30")
+        self.assertEqual(string_at(buf, written), b"10 + 20 = 30")
 
         # Float formatting
-        written = sprintf(buf, b"Pi is approximately %.2f", c_double(3.14159))
+        memset(buf, 0, sizeof(buf))
+        written = sprintf(buf, FMT_PI, c_double(3.14159))
         self.assertGreater(written, 0)
-        self.assertEqual(buf.value, b"Pi is approximately 3.14")
+        self.assertEqual(string_at(buf, written), b"Pi is approximately 3.14")
 
     def test_pointer_returns(self):
         """Test functions returning pointers"""
-        malloc = self.libc.malloc
-        malloc.argtypes = [c_size_t]
-        malloc.restype = c_void_p
+        malloc = bind(self.libc.malloc, (c_size_t,), c_void_p)
 
-        free = self.libc.free
-        free.argtypes = [c_void_p]
-        free.restype = None
+        free = bind(self.libc.free, (c_void_p,), None)
 
         ptr = malloc(1024)
         self.assertNotEqual(ptr, 0, "malloc should return non-null pointer")
@@ -249,18 +244,14 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
     def test_int_address_requires_c_void_p(self):
         """Raw int address → use c_void_p argtype (Python-idiomatic)"""
         # With c_char_p: Python raises TypeError on a plain int
-        strlen_bad = self.libc.strlen
-        strlen_bad.argtypes = [c_char_p]
-        strlen_bad.restype = c_size_t
+        strlen_bad = bind(self.libc.strlen, (c_char_p,), c_size_t)
         buf = create_string_buffer(b"Hello")
         addr = addressof(buf)
         with self.assertRaises((TypeError, Exception)):
             strlen_bad(addr)
 
-        # With c_void_p: works
-        strlen_ok = self.libc.strlen
-        strlen_ok.argtypes = [c_void_p]
-        strlen_ok.restype = c_size_t
+        # With c_void_p: works (a private copy, the shared strlen keeps c_char_p)
+        strlen_ok = bind(self.libc["strlen"], (c_void_p,), c_size_t)
         self.assertEqual(strlen_ok(addr), 5)
 
     def test_int_address_to_wcslen_via_c_void_p(self):
@@ -269,8 +260,7 @@ class TestFunctionsAndCallbacks(unittest.TestCase):
             wcslen = self.libc.wcslen
         except AttributeError:
             self.skipTest("wcslen not exported by this libc")
-        wcslen.argtypes = [c_void_p]
-        wcslen.restype = c_size_t
+        bind(wcslen, (c_void_p,), c_size_t)
 
         wbuf = create_unicode_buffer("Hello")
         self.assertEqual(wcslen(addressof(wbuf)), 5)
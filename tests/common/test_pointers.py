@@ -19,8 +19,35 @@ from ctypes import (
     sizeof,
     addressof,
     byref,
+    memmove,
+    memset,
 )
 
+from _libs import bind, load_libc
+
+# Pointer types used throughout; POINTER() memoizes, so these are the same
+# objects any in-body POINTER(c_int32) call would return
+_INT_PTR = POINTER(c_int32)
+_CHAR_PTR = POINTER(c_char)
+_DOUBLE_PTR = POINTER(c_double)
+
+
+class Point(Structure):
+    _fields_ = [("x", c_int32), ("y", c_int32)]
+
+
+def _ptr_addr(p):
+    """Return the address p holds as an int, 0 for NULL"""
+    return cast(p, c_void_p).value or 0
+
+
+def _fast_deref(p):
+    """View the c_int32 that p points at, bound directly to its address"""
+    addr = _ptr_addr(p)
+    if not addr:
+        raise ValueError("NULL pointer access")
+    return c_int32.from_address(addr)
+
 
 class TestPOINTERTypeCreation(unittest.TestCase):
     """Test POINTER type creation"""
@@ -32,11 +59,12 @@ class TestPOINTERTypeCreation(unittest.TestCase):
         # Check that it's a pointer type
         self.assertTrue(hasattr(IntPtr, '_type_'))
         self.assertEqual(IntPtr._type_, c_int32)
+        # POINTER() caches per target type
+        self.assertIs(IntPtr, _INT_PTR)
 
     def test_pointer_type_repr(self):
         """POINTER type has meaningful repr"""
-        IntPtr = POINTER(c_int32)
-        repr_str = repr(IntPtr)
+        repr_str = repr(_INT_PTR)
         # c_int32 may be c_long on some platforms
         self.assertIn('LP_c_', repr_str)
 
@@ -46,16 +74,17 @@ class TestPOINTERInstanceCreation(unittest.TestCase):
 
     def test_create_null_pointer(self):
         """Creating pointer without args creates NULL pointer"""
-        IntPtr = POINTER(c_int32)
-        p = IntPtr()
+        p = _INT_PTR()
         # NULL pointer - accessing contents would raise ValueError
         self.assertFalse(bool(p))
+        self.assertEqual(_ptr_addr(p), 0)
 
     def test_create_pointer_from_value(self):
         """Create pointer from existing c_int32"""
         x = c_int32(42)
         p = pointer(x)
         self.assertTrue(bool(p))
+        self.assertEqual(_ptr_addr(p), addressof(x))
         self.assertEqual(p.contents.value, 42)
 
 
@@ -68,6 +97,20 @@ class TestPOINTERContentsProperty(unittest.TestCase):
         p = pointer(x)
         self.assertEqual(p.contents.value, 42)
 
+    def test_contents_reads_value_fast(self):
+        """from_address view sees the same memory as .contents"""
+        x = c_int32(42)
+        p = pointer(x)
+        view = _fast_deref(p)
+        self.assertEqual(view.value, p.contents.value)
+        self.assertEqual(addressof(view), addressof(p.contents))
+        # The view is bound once and tracks later writes
+        x.value = 7
+        self.assertEqual(view.value, 7)
+        # NULL raises like .contents instead of reading address 0
+        with self.assertRaises(ValueError):
+            _fast_deref(_INT_PTR())
+
     def test_contents_writes_value(self):
         """.contents can be assigned to change pointed value"""
         x = c_int32(42)
@@ -79,8 +122,7 @@ class TestPOINTERContentsProperty(unittest.TestCase):
 
     def test_contents_throws_on_null_pointer(self):
         """.contents throws on NULL pointer"""
-        IntPtr = POINTER(c_int32)
-        p = IntPtr()
+        p = _INT_PTR()
         with self.assertRaises(ValueError):
             _ = p.contents
 
@@ -98,15 +140,15 @@ class TestPOINTERIndexing(unittest.TestCase):
         """[n] reads values with offset (pointer arithmetic)"""
         # Create array of 3 int32s
         arr = (c_int32 * 3)(10, 20, 30)
-        p = cast(arr, POINTER(c_int32))
-        self.assertEqual(p[0], 10)
+        p = cast(arr, _INT_PTR)
         self.assertEqual(p[1], 20)
-        self.assertEqual(p[2], 30)
+        # A slice converts the whole run in one C-level loop
+        self.assertEqual(p[:3], [10, 20, 30])
 
     def test_index_write(self):
         """[n] = value writes with offset"""
         arr = (c_int32 * 3)(0, 0, 0)
-        p = cast(arr, POINTER(c_int32))
+        p = cast(arr, _INT_PTR)
         p[0] = 100
         p[1] = 200
         p[2] = 300
@@ -114,6 +156,21 @@ class TestPOINTERIndexing(unittest.TestCase):
         self.assertEqual(arr[1], 200)
         self.assertEqual(arr[2], 300)
 
+    def test_bulk_write_through_pointer(self):
+        """memset/memmove through a pointer match indexed writes"""
+        for n in (3, 1024):
+            with self.subTest(n=n):
+                arr = (c_int32 * n)(*[7] * n)
+                p = cast(arr, _INT_PTR)
+                memset(p, 0, sizeof(arr))
+                self.assertEqual(arr[:], [0] * n)
+
+                values = [100 * (i + 1) for i in range(n)]
+                src = (c_int32 * n)(*values)
+                memmove(p, src, sizeof(src))
+                self.assertEqual(p[n - 1], values[-1])
+                self.assertEqual(arr[:], values)
+
 
 class TestPointerFunction(unittest.TestCase):
     """Test pointer() function"""
@@ -135,12 +192,6 @@ class TestPointerFunction(unittest.TestCase):
 
     def test_pointer_to_structure(self):
         """pointer(Structure) creates pointer to struct"""
-        class Point(Structure):
-            _fields_ = [
-                ("x", c_int32),
-                ("y", c_int32),
-            ]
-
         pt = Point(10, 20)
         p = pointer(pt)
         self.assertIsNotNone(p)
@@ -161,10 +212,10 @@ class TestPOINTERDifferentTypes(unittest.TestCase):
     def test_pointer_to_char(self):
         """POINTER(c_char)"""
         arr = (c_char * 3)(b'A', b'B', b'C')
-        p = cast(arr, POINTER(c_char))
-        self.assertEqual(p[0], b'A')
+        p = cast(arr, _CHAR_PTR)
         self.assertEqual(p[1], b'B')
-        self.assertEqual(p[2], b'C')
+        # c_char pointer slices come back as a single bytes object
+        self.assertEqual(p[:3], b'ABC')
 
 
 class TestPOINTERAddressOf(unittest.TestCase):
@@ -190,35 +241,19 @@ class TestPOINTERInFunctionDefinitions(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        """Load the C library in a cross-platform way"""
-        from ctypes import CDLL
-        import sys
-        
-        if sys.platform == "win32":
-            cls.libc = CDLL("msvcrt")
-        elif sys.platform == "darwin":
-            cls.libc = CDLL("libSystem.B.dylib")
-        else:
-            # Linux
-            try:
-                cls.libc = CDLL("libc.so.6")
-            except OSError:
-                cls.libc = CDLL(None)
+        """Reuse the shared C library handle"""
+        cls.libc = load_libc()
 
     def test_pointer_as_argument_type(self):
         """POINTER type can be used as function argument type"""
         from ctypes import c_void_p, c_size_t
         
-        IntPtr = POINTER(c_int32)
-        
         # Define memset with pointer argument
-        memset = self.libc.memset
-        memset.argtypes = [IntPtr, c_int32, c_size_t]
-        memset.restype = c_void_p
+        memset = bind(self.libc.memset, (_INT_PTR, c_int32, c_size_t), c_void_p)
         
         # Create buffer and call memset
         buf = (c_char * 10)()
-        memset(cast(buf, IntPtr), 0x42, 10)
+        memset(cast(buf, _INT_PTR), 0x42, 10)
         
         # Verify buffer was filled
         self.assertEqual(buf[0], b'\x42')
@@ -228,12 +263,8 @@ class TestPOINTERInFunctionDefinitions(unittest.TestCase):
         """POINTER type can be used as return type"""
         from ctypes import c_void_p, c_size_t
         
-        CharPtr = POINTER(c_char)
-        
         # memchr returns a pointer
-        memchr = self.libc.memchr
-        memchr.argtypes = [c_void_p, c_int32, c_size_t]
-        memchr.restype = CharPtr
+        memchr = bind(self.libc.memchr, (c_void_p, c_int32, c_size_t), _CHAR_PTR)
         
         buf = b"Hello World"
         result = memchr(buf, ord('W'), len(buf))
@@ -252,7 +283,7 @@ class TestCastWithPOINTER(unittest.TestCase):
     def test_cast_array_to_pointer(self):
         """Python: cast(arr, POINTER(c_int32))"""
         arr = (c_int32 * 3)(100, 200, 300)
-        p = cast(arr, POINTER(c_int32))
+        p = cast(arr, _INT_PTR)
         self.assertEqual(p[0], 100)
         self.assertEqual(p[1], 200)
         self.assertEqual(p[2], 300)
@@ -262,14 +293,14 @@ class TestCastWithPOINTER(unittest.TestCase):
         val = c_int32(12345)
         addr = addressof(val)
         voidP = c_void_p(addr)
-        p = cast(voidP, POINTER(c_int32))
+        p = cast(voidP, _INT_PTR)
         self.assertEqual(p[0], 12345)
 
     def test_cast_preserves_type(self):
         """cast returns correctly typed pointer"""
         val = c_double(3.14)
         p = pointer(val)
-        p2 = cast(p, POINTER(c_double))
+        p2 = cast(p, _DOUBLE_PTR)
         self.assertAlmostEqual(p2[0], 3.14, places=2)
 
     def test_cast_pointer_to_different_type(self):
@@ -283,7 +314,7 @@ class TestCastWithPOINTER(unittest.TestCase):
     def test_cast_write_through(self):
         """cast pointer allows write-through"""
         arr = (c_int32 * 2)(0, 0)
-        p = cast(arr, POINTER(c_int32))
+        p = cast(arr, _INT_PTR)
         p[0] = 111
         p[1] = 222
         self.assertEqual(arr[0], 111)
@@ -296,8 +327,6 @@ class TestAddressofExtras(unittest.TestCase):
     """Additional addressof() tests"""
 
     def test_struct_addressof(self):
-        class Point(Structure):
-            _fields_ = [("x", c_int32), ("y", c_int32)]
         pt = Point(10, 20)
         addr = addressof(pt)
         self.assertIsInstance(addr, int)
@@ -307,7 +336,7 @@ class TestAddressofExtras(unittest.TestCase):
         """addressof -> cast -> read back"""
         x = c_int32(42)
         addr = addressof(x)
-        p = cast(c_void_p(addr), POINTER(c_int32))
+        p = cast(c_void_p(addr), _INT_PTR)
         self.assertEqual(p[0], 42)
 
 
@@ -318,7 +347,7 @@ class TestPointerDoubleArrayWalk(unittest.TestCase):
 
     def test_double_array_walk(self):
         arr = (c_double * 3)(1.1, 2.2, 3.3)
-        p = cast(arr, POINTER(c_double))
+        p = cast(arr, _DOUBLE_PTR)
         self.assertAlmostEqual(p[0], 1.1, places=1)
         self.assertAlmostEqual(p[1], 2.2, places=1)
         self.assertAlmostEqual(p[2], 3.3, places=1)
@@ -336,8 +365,6 @@ class TestByref(unittest.TestCase):
         self.assertIsNotNone(ref)
 
     def test_byref_struct(self):
-        class Point(Structure):
-            _fields_ = [("x", c_int32), ("y", c_int32)]
         pt = Point(10, 20)
         ref = byref(pt)
         self.assertIsNotNone(ref)
@@ -352,7 +379,7 @@ class TestCastBufferToPointer(unittest.TestCase):
         # In Python ctypes la prassi è usare un array come storage e
         # castare alla POINTER(T) desiderata.
         buf = (c_int32 * 1)(0x12345678)
-        p = cast(buf, POINTER(c_int32))
+        p = cast(buf, _INT_PTR)
         self.assertEqual(p.contents.value, 0x12345678)
 
 
@@ -362,14 +389,14 @@ class TestPointerArithmetic(unittest.TestCase):
     def test_indexing_via_cast(self):
         IntArr5 = c_int32 * 5
         arr = IntArr5(10, 20, 30, 40, 50)
-        p = cast(arr, POINTER(c_int32))
+        p = cast(arr, _INT_PTR)
         for i in range(5):
             self.assertEqual(p[i], (i + 1) * 10)
 
     def test_write_via_indexing(self):
         IntArr3 = c_int32 * 3
         arr = IntArr3(0, 0, 0)
-        p = cast(arr, POINTER(c_int32))
+        p = cast(arr, _INT_PTR)
         p[0] = 11
         p[1] = 22
         p[2] = 33
@@ -8,32 +8,21 @@ Esercita lo stesso pattern di tests/common/test_struct_by_value.js usando
 """
 
 import ctypes
-import ctypes.util
-import sys
 import unittest
-from ctypes import CDLL, Structure, c_int
+from ctypes import Structure, c_int
+
+from _libs import bind, load_libc
 
 
 class DivT(Structure):
     _fields_ = [("quot", c_int), ("rem", c_int)]
 
 
-def _load_libc():
-    if sys.platform == "darwin":
-        return CDLL("/usr/lib/libSystem.dylib")
-    if sys.platform == "win32":
-        return CDLL("msvcrt.dll")
-    # Linux e simili: find_library("c") → libc.so.6
-    return CDLL(ctypes.util.find_library("c"))
-
-
 class TestStructByValue(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.libc = _load_libc()
-        cls.div = cls.libc.div
-        cls.div.argtypes = [c_int, c_int]
-        cls.div.restype = DivT
+        cls.libc = load_libc()
+        cls.div = bind(cls.libc.div, (c_int, c_int), DivT)
 
     def test_div_returns_struct(self):
         r = self.div(17, 5)
@@ -3,24 +3,108 @@ Test Structs and Unions - Cross Platform
 Tests struct/union creation, nested structs, bit fields, anonymous fields
 """
 
+import struct
 import unittest
+from collections import namedtuple
 from ctypes import (
     Structure, Union, c_int32, c_uint32, c_uint16, c_int16, c_int64,
     sizeof, c_uint8, c_float, c_double,
-    c_void_p, POINTER, pointer,
-    c_int8, c_int,
+    c_void_p, POINTER, pointer, byref,
+    c_int8, c_int, memset, memmove, addressof,
     BigEndianStructure, LittleEndianStructure, BigEndianUnion, LittleEndianUnion,
 )
 
+
+class Point(Structure):
+    _fields_ = [("x", c_int32), ("y", c_int32)]
+
+
+class Rectangle(Structure):
+    _fields_ = [("topLeft", Point), ("bottomRight", Point), ("color", c_uint32)]
+
+
+class Flags(Structure):
+    _fields_ = [
+        ("enabled", c_uint32, 1),
+        ("mode", c_uint32, 3),
+        ("priority", c_uint32, 4),
+        ("reserved", c_uint32, 24),
+    ]
+
+
+class Coords(Structure):
+    _fields_ = [("x", c_int32), ("y", c_int32)]
+
+
+class Entity(Structure):
+    _anonymous_ = ("pos",)
+    _fields_ = [("id", c_uint32), ("pos", Coords), ("health", c_int32)]
+
+
+# Byte offsets of the nested corner coordinates, resolved once
+RECT_TOP_LEFT_X = Rectangle.topLeft.offset + Point.x.offset
+RECT_BOTTOM_RIGHT_X = Rectangle.bottomRight.offset + Point.x.offset
+RECT_BOTTOM_RIGHT_Y = Rectangle.bottomRight.offset + Point.y.offset
+
+
+def read_int32_at(obj, offset):
+    """Read the c_int32 stored offset bytes into obj"""
+    return c_int32.from_address(addressof(obj) + offset).value
+
+
+def leaf_fields(struct_type, offset=0, prefix=""):
+    """Yield (name, offset, ctype) for each scalar field of struct_type
+
+    Nested structures are flattened as <field>_<member>; members of an
+    _anonymous_ field keep their own names, as they do on the struct.
+    """
+    anonymous = getattr(struct_type, "_anonymous_", ())
+    for name, ctype in struct_type._fields_:
+        field_offset = offset + getattr(struct_type, name).offset
+        if issubclass(ctype, Structure):
+            sub_prefix = prefix if name in anonymous else f"{prefix}{name}_"
+            yield from leaf_fields(ctype, field_offset, sub_prefix)
+        else:
+            yield prefix + name, field_offset, ctype
+
+
+def make_soa(struct_type, n):
+    """Return a structure-of-arrays namedtuple: one zeroed ctype * n per leaf field"""
+    leaves = list(leaf_fields(struct_type))
+    soa_type = namedtuple(f"{struct_type.__name__}SoA", [name for name, _, _ in leaves])
+    return soa_type(*((ctype * n)() for _, _, ctype in leaves))
+
+
+def aos_to_soa(aos):
+    """Scatter an array of structures into a new structure of arrays"""
+    struct_type = aos._type_
+    soa = make_soa(struct_type, len(aos))
+    for (_, offset, ctype), column in zip(leaf_fields(struct_type), soa):
+        for i in range(len(aos)):
+            column[i] = ctype.from_buffer(aos, i * sizeof(struct_type) + offset).value
+    return soa
+
+
+def soa_to_aos(struct_type, soa):
+    """Gather a structure of arrays back into a new struct_type array"""
+    n = len(soa[0])
+    aos = (struct_type * n)()
+    for (_, offset, ctype), column in zip(leaf_fields(struct_type), soa):
+        size = sizeof(ctype)
+        for i in range(n):
+            memmove(addressof(aos) + i * sizeof(struct_type) + offset,
+                    addressof(column) + i * size, size)
+    return aos
+
+
+def pack_flags(enabled, mode, priority):
+    """Pack the Flags bit fields into one uint32 word"""
+    return (enabled & 0x1) | ((mode & 0x7) << 1) | ((priority & 0xF) << 4)
+
+
 class TestStructsAndUnions(unittest.TestCase):
     def test_basic_struct(self):
         """Test create and use simple struct"""
-        class Point(Structure):
-            _fields_ = [
-                ("x", c_int32),
-                ("y", c_int32)
-            ]
-        
         p = Point(10, 20)
         self.assertEqual(p.x, 10)
         self.assertEqual(p.y, 20)
@@ -30,29 +114,10 @@ class TestStructsAndUnions(unittest.TestCase):
     
     def test_struct_size_and_alignment(self):
         """Test struct has correct size and alignment"""
-        class Point(Structure):
-            _fields_ = [
-                ("x", c_int32),
-                ("y", c_int32)
-            ]
-        
         self.assertEqual(sizeof(Point), 8)
     
     def test_nested_structs(self):
         """Test nested structs"""
-        class Point(Structure):
-            _fields_ = [
-                ("x", c_int32),
-                ("y", c_int32)
-            ]
-        
-        class Rectangle(Structure):
-            _fields_ = [
-                ("topLeft", Point),
-                ("bottomRight", Point),
-                ("color", c_uint32)
-            ]
-        
         rect = Rectangle()
         rect.topLeft.x = 0
         rect.topLeft.y = 0
@@ -65,6 +130,50 @@ class TestStructsAndUnions(unittest.TestCase):
         self.assertEqual(rect.bottomRight.x, 100)
         self.assertEqual(rect.bottomRight.y, 200)
         self.assertEqual(rect.color, 0xFF0000)
+        # Both corners embed the one module-level Point type
+        self.assertIs(type(rect.topLeft), Point)
+        self.assertIs(type(rect.bottomRight), Point)
+
+        # Flat offset reads see the same values as the attribute chain
+        self.assertEqual(read_int32_at(rect, RECT_TOP_LEFT_X), 0)
+        self.assertEqual(read_int32_at(rect, RECT_BOTTOM_RIGHT_X), 100)
+        self.assertEqual(read_int32_at(rect, RECT_BOTTOM_RIGHT_Y), 200)
+
+    def test_nested_structs_soa(self):
+        """Test nested struct arrays round-trip through one array per field"""
+        rects = (Rectangle * 3)()
+        for i, rect in enumerate(rects):
+            rect.topLeft.x = i
+            rect.topLeft.y = -i
+            rect.bottomRight.x = 100 + i
+            rect.bottomRight.y = 200 + i
+        rects[2].color = 0xFFFFFFFF
+
+        soa = aos_to_soa(rects)
+        self.assertEqual(
+            soa._fields,
+            ("topLeft_x", "topLeft_y", "bottomRight_x", "bottomRight_y", "color"),
+        )
+        self.assertEqual(list(soa.topLeft_y), [0, -1, -2])
+        self.assertEqual(list(soa.bottomRight_x), [100, 101, 102])
+        self.assertEqual(soa.color[2], 0xFFFFFFFF)  # c_uint32, like Rectangle.color
+        self.assertEqual(bytes(soa_to_aos(Rectangle, soa)), bytes(rects))
+
+        entities = (Entity * 3)()
+        for i, ent in enumerate(entities):
+            ent.id = i + 1
+            ent.x = 100 * i
+            ent.y = 200 * i
+            ent.health = 100 - i
+
+        soa = aos_to_soa(entities)
+        # The anonymous pos members keep their promoted x/y names
+        self.assertEqual(soa._fields, ("id", "x", "y", "health"))
+        self.assertEqual(list(soa.x), [ent.x for ent in entities])
+        self.assertEqual(list(soa.health), [100, 99, 98])
+        self.assertEqual(bytes(soa_to_aos(Entity, soa)), bytes(entities))
+        # Each column is densely packed: no per-element padding
+        self.assertEqual(sizeof(soa.id), len(entities) * sizeof(c_uint32))
     
     def test_union(self):
         """Test create and use unions"""
@@ -95,14 +204,6 @@ class TestStructsAndUnions(unittest.TestCase):
     
     def test_bit_fields(self):
         """Test bit fields"""
-        class Flags(Structure):
-            _fields_ = [
-                ("enabled", c_uint32, 1),
-                ("mode", c_uint32, 3),
-                ("priority", c_uint32, 4),
-                ("reserved", c_uint32, 24)
-            ]
-        
         f = Flags()
         f.enabled = 1
         f.mode = 5
@@ -111,6 +212,12 @@ class TestStructsAndUnions(unittest.TestCase):
         self.assertEqual(f.enabled, 1)
         self.assertEqual(f.mode, 5)
         self.assertEqual(f.priority, 15)
+
+        # Same word built in one expression (little-endian host layout)
+        packed = pack_flags(1, 5, 15)
+        self.assertEqual(bytes(f), struct.pack("<I", packed))
+        g = Flags.from_buffer_copy(struct.pack("<I", packed))
+        self.assertEqual((g.enabled, g.mode, g.priority), (1, 5, 15))
     
     def test_bit_field_overflow(self):
         """Test bit field overflow is handled correctly"""
@@ -122,6 +229,8 @@ class TestStructsAndUnions(unittest.TestCase):
         f = Flags()
         f.value = 15  # 0b1111 - overflow
         self.assertEqual(f.value, 7)  # Truncated to 0b111
+        # The stored word is the value masked to the field width
+        self.assertEqual(bytes(f), struct.pack("<I", 15 & 0b111))
     
     def test_anonymous_union_fields(self):
         """Test anonymous union fields"""
@@ -145,23 +254,16 @@ class TestStructsAndUnions(unittest.TestCase):
         # Anonymous field members are promoted to parent level
         self.assertEqual(obj.i, 42)
         self.assertEqual(obj.tag, 1)
+
+        # The same object decoded from its raw bytes in one copy
+        payload = struct.pack("<II", 1, 42)
+        self.assertEqual(bytes(obj), payload)
+        copy = Outer.from_buffer_copy(payload)
+        self.assertEqual(copy.tag, 1)
+        self.assertEqual(copy.i, 42)
     
     def test_nested_anonymous_structures(self):
         """Test nested anonymous structures"""
-        class Coords(Structure):
-            _fields_ = [
-                ("x", c_int32),
-                ("y", c_int32)
-            ]
-        
-        class Entity(Structure):
-            _anonymous_ = ("pos",)
-            _fields_ = [
-                ("id", c_uint32),
-                ("pos", Coords),
-                ("health", c_int32)
-            ]
-        
         ent = Entity()
         ent.id = 1
         ent.x = 100   # From anonymous Coords
@@ -172,7 +274,7 @@ class TestStructsAndUnions(unittest.TestCase):
         self.assertEqual(ent.x, 100)
         self.assertEqual(ent.y, 200)
         self.assertEqual(ent.health, 100)
-    
+
     def test_packed_structs(self):
         """Test packed structs"""
         class Unpacked(Structure):
@@ -195,6 +297,19 @@ class TestStructsAndUnions(unittest.TestCase):
         
         # Packed has no padding
         self.assertEqual(sizeof(Packed), 6)
+
+        # Declaring fields by descending alignment removes the interior
+        # padding without _pack_: only 2 trailing bytes remain
+        class UnpackedReordered(Structure):
+            _fields_ = [
+                ("b", c_uint32),
+                ("a", c_uint8),
+                ("c", c_uint8)
+            ]
+
+        self.assertEqual(UnpackedReordered.c.offset, 5)
+        self.assertEqual(sizeof(UnpackedReordered), 8)
+        self.assertLess(sizeof(UnpackedReordered), sizeof(Unpacked))
     
     def test_struct_with_arrays(self):
         """Test arrays in struct fields"""
@@ -213,6 +328,11 @@ class TestStructsAndUnions(unittest.TestCase):
         self.assertEqual(data.values[0], 1)
         self.assertEqual(data.values[9], 10)
 
+        # One memset clears the count and the whole embedded array
+        memset(byref(data), 0, sizeof(data))
+        self.assertEqual(data.count, 0)
+        self.assertEqual(list(data.values), [0] * 10)
+
 
 # ─── POINTER() in Structure _fields_ ───
 
@@ -420,19 +540,116 @@ class TestBigEndianUnion(unittest.TestCase):
         self.assertEqual(v.bytes[0], 0x12)
 
 
-class TestComplexNestedStructures(unittest.TestCase):
-    """Test complex nested structure handling"""
+# ─── Structures shared by TestComplexNestedStructures ───
+
+class Point2D(Structure):
+    _fields_ = [("x", c_int32), ("y", c_int32)]
+
+
+class Point3D(Structure):
+    _fields_ = [("point2d", Point2D), ("z", c_int32)]
+
+
+class BoundingBox(Structure):
+    _fields_ = [("min", Point3D), ("max", Point3D)]
+
+
+class SizeInner(Structure):
+    _fields_ = [("value", c_int32)]
+
+
+class SizeMiddle(Structure):
+    _fields_ = [("inner", SizeInner), ("extra", c_int32)]
+
+
+class SizeOuter(Structure):
+    _fields_ = [("middle", SizeMiddle), ("final", c_int32)]
+
+
+class Polygon(Structure):
+    _fields_ = [("vertices", Point * 4), ("count", c_int32)]
 
-    def test_multi_level_nesting(self):
-        class Point2D(Structure):
-            _fields_ = [("x", c_int32), ("y", c_int32)]
 
-        class Point3D(Structure):
-            _fields_ = [("point2d", Point2D), ("z", c_int32)]
+class Value(Union):
+    _fields_ = [("asInt", c_int32), ("asBytes", c_uint8 * 4)]
+
+
+class Tagged(Structure):
+    _fields_ = [("tag", c_uint16), ("value", Value)]
+
+
+class IPv4Address(Structure):
+    _fields_ = [("octets", c_uint8 * 4)]
+
+
+class MACAddress(Structure):
+    _fields_ = [("bytes", c_uint8 * 6)]
+
+
+class EthernetHeader(Structure):
+    _fields_ = [("destination", MACAddress), ("source", MACAddress), ("etherType", c_uint16)]
+
+
+class IPv4Header(Structure):
+    _fields_ = [
+        ("versionAndHeaderLength", c_uint8),
+        ("typeOfService", c_uint8),
+        ("totalLength", c_uint16),
+        ("identification", c_uint16),
+        ("flagsAndFragmentOffset", c_uint16),
+        ("timeToLive", c_uint8),
+        ("protocol", c_uint8),
+        ("headerChecksum", c_uint16),
+        ("sourceAddress", IPv4Address),
+        ("destinationAddress", IPv4Address),
+    ]
+
+
+class Packet(Structure):
+    _fields_ = [("ethernet", EthernetHeader), ("ipv4", IPv4Header)]
+
+
+# Native-order packers matching the (padding-free) header layouts above
+ETHERNET_SOURCE_AND_TYPE = struct.Struct("=6sH")
+IPV4_FIXED_FIELDS = struct.Struct("=BBHHHBBH")
+IPV4_OCTETS = struct.Struct("4B")
+
+# Raw bytes test_network_packet_structure must produce (little-endian host)
+EXPECTED_PACKET = bytes.fromhex(
+    "ffffffffffff" "000000000055" "0008"          # Ethernet: dst, src, type
+    "45" "00" "0000" "0000" "0000" "00" "06" "0000"  # IPv4 fixed fields
+    "c0000000" "08000000"                         # IPv4 src, dst
+)
 
-        class BoundingBox(Structure):
-            _fields_ = [("min", Point3D), ("max", Point3D)]
 
+class AlignInner(Structure):
+    _fields_ = [("byte1", c_uint8), ("int1", c_int32)]
+
+
+class AlignOuter(Structure):
+    _fields_ = [("byte2", c_uint8), ("nested", AlignInner), ("byte3", c_uint8)]
+
+
+class Color(Structure):
+    _fields_ = [("r", c_uint8), ("g", c_uint8), ("b", c_uint8), ("a", c_uint8)]
+
+
+IMAGE_PIXELS = 64
+
+
+# Structure-of-arrays image: each field is contiguous across all pixels
+class ImageSoA(Structure):
+    _fields_ = [
+        ("xs", c_uint16 * IMAGE_PIXELS),
+        ("ys", c_uint16 * IMAGE_PIXELS),
+        ("colors", Color * IMAGE_PIXELS),
+    ]
+
+
+class TestComplexNestedStructures(unittest.TestCase):
+    """Test complex nested structure handling"""
+
+    def test_multi_level_nesting(self):
         bbox = BoundingBox()
         bbox.min.point2d.x = 10
         bbox.min.point2d.y = 20
@@ -449,45 +666,21 @@ class TestComplexNestedStructures(unittest.TestCase):
         self.assertEqual(bbox.max.z, 300)
 
     def test_correct_size_for_nested_structs(self):
-        class Inner(Structure):
-            _fields_ = [("value", c_int32)]
-        class Middle(Structure):
-            _fields_ = [("inner", Inner), ("extra", c_int32)]
-        class Outer(Structure):
-            _fields_ = [("middle", Middle), ("final", c_int32)]
-
-        self.assertEqual(sizeof(Inner), 4)
-        self.assertEqual(sizeof(Middle), 8)
-        self.assertEqual(sizeof(Outer), 12)
+        self.assertEqual(sizeof(SizeInner), 4)
+        self.assertEqual(sizeof(SizeMiddle), 8)
+        self.assertEqual(sizeof(SizeOuter), 12)
 
     def test_array_of_structs_within_struct(self):
-        class Point(Structure):
-            _fields_ = [("x", c_int32), ("y", c_int32)]
-
-        class Polygon(Structure):
-            _fields_ = [("vertices", Point * 4), ("count", c_int32)]
-
-        poly = Polygon()
-        poly.vertices[0].x = 0
-        poly.vertices[0].y = 0
-        poly.vertices[1].x = 100
-        poly.vertices[1].y = 0
-        poly.vertices[2].x = 100
-        poly.vertices[2].y = 100
-        poly.vertices[3].x = 0
-        poly.vertices[3].y = 100
-        poly.count = 4
+        poly = Polygon(
+            vertices=(Point(0, 0), Point(100, 0), Point(100, 100), Point(0, 100)),
+            count=4,
+        )
 
         self.assertEqual(poly.vertices[1].x, 100)
         self.assertEqual(poly.vertices[2].y, 100)
         self.assertEqual(poly.count, 4)
 
     def test_union_nested_in_struct(self):
-        class Value(Union):
-            _fields_ = [("asInt", c_int32), ("asBytes", c_uint8 * 4)]
-        class Tagged(Structure):
-            _fields_ = [("tag", c_uint16), ("value", Value)]
-
         tagged = Tagged()
         tagged.tag = 1
         tagged.value.asInt = 0x12345678
@@ -500,28 +693,7 @@ class TestComplexNestedStructures(unittest.TestCase):
         self.assertEqual(tagged.value.asBytes[3], 0x12)
 
     def test_network_packet_structure(self):
-        class IPv4Address(Structure):
-            _fields_ = [("octets", c_uint8 * 4)]
-        class MACAddress(Structure):
-            _fields_ = [("bytes", c_uint8 * 6)]
-        class EthernetHeader(Structure):
-            _fields_ = [("destination", MACAddress), ("source", MACAddress), ("etherType", c_uint16)]
-        class IPv4Header(Structure):
-            _fields_ = [
-                ("versionAndHeaderLength", c_uint8),
-                ("typeOfService", c_uint8),
-                ("totalLength", c_uint16),
-                ("identification", c_uint16),
-                ("flagsAndFragmentOffset", c_uint16),
-                ("timeToLive", c_uint8),
-                ("protocol", c_uint8),
-                ("headerChecksum", c_uint16),
-                ("sourceAddress", IPv4Address),
-                ("destinationAddress", IPv4Address),
-            ]
-        class Packet(Structure):
-            _fields_ = [("ethernet", EthernetHeader), ("ipv4", IPv4Header)]
-
+        # Field by field through the nested ctypes setters
         packet = Packet()
         for i in range(6):
             packet.ethernet.destination.bytes[i] = 0xFF
@@ -540,13 +712,25 @@ class TestComplexNestedStructures(unittest.TestCase):
         self.assertEqual(packet.ipv4.sourceAddress.octets[0], 192)
         self.assertEqual(packet.ipv4.destinationAddress.octets[0], 8)
 
-    def test_alignment_in_nested_structs(self):
-        class Inner(Structure):
-            _fields_ = [("byte1", c_uint8), ("int1", c_int32)]
-        class Outer(Structure):
-            _fields_ = [("byte2", c_uint8), ("nested", Inner), ("byte3", c_uint8)]
+        # The same packet written in bulk with the native-order packers
+        packed = Packet()
+        memset(packed.ethernet.destination.bytes, 0xFF, 6)
+        ETHERNET_SOURCE_AND_TYPE.pack_into(
+            packed, Packet.ethernet.offset + EthernetHeader.source.offset,
+            b"\x00\x00\x00\x00\x00\x55", 0x0800,
+        )
+        IPV4_FIXED_FIELDS.pack_into(
+            packed, Packet.ipv4.offset, 0x45, 0, 0, 0, 0, 0, 6, 0,
+        )
+        IPV4_OCTETS.pack_into(packed.ipv4.sourceAddress.octets, 0, 192, 0, 0, 0)
+        IPV4_OCTETS.pack_into(packed.ipv4.destinationAddress.octets, 0, 8, 0, 0, 0)
+
+        self.assertEqual(sizeof(Packet), len(EXPECTED_PACKET))
+        self.assertEqual(bytes(packet), EXPECTED_PACKET)
+        self.assertEqual(bytes(packed), EXPECTED_PACKET)
 
-        outer = Outer()
+    def test_alignment_in_nested_structs(self):
+        outer = AlignOuter()
         outer.byte2 = 1
         outer.nested.byte1 = 2
         outer.nested.int1 = 12345
@@ -557,6 +741,20 @@ class TestComplexNestedStructures(unittest.TestCase):
         self.assertEqual(outer.nested.int1, 12345)
         self.assertEqual(outer.byte3, 3)
 
+    def test_image_soa_bulk_fill(self):
+        img = ImageSoA()
+        # The colors block is contiguous, so one memset covers every pixel
+        memset(addressof(img) + ImageSoA.colors.offset, 0xFF,
+               IMAGE_PIXELS * sizeof(Color))
+
+        self.assertEqual(bytes(img.colors), b"\xff" * (IMAGE_PIXELS * sizeof(Color)))
+        self.assertEqual(img.colors[0].r, 0xFF)
+        self.assertEqual(img.colors[IMAGE_PIXELS - 1].a, 0xFF)
+        # Neighbouring coordinate arrays are untouched
+        self.assertEqual(img.ys[IMAGE_PIXELS - 1], 0)
+        self.assertEqual(sizeof(ImageSoA),
+                         2 * IMAGE_PIXELS * sizeof(c_uint16) + IMAGE_PIXELS * sizeof(Color))
+
 
 class TestSignedBitfields(unittest.TestCase):
     def test_c_int8_bitfield_roundtrip_negative(self):
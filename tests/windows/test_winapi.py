@@ -12,16 +12,64 @@ if sys.platform != 'win32':
 
 from ctypes import (
     WinDLL, Structure, c_uint16, sizeof, byref, create_unicode_buffer,
-    get_last_error, set_last_error, WinError, POINTER, c_void_p, c_size_t, c_int32
+    get_last_error, set_last_error, WinError, POINTER, c_void_p, c_size_t, c_int32,
+    memset, string_at
 )
 from ctypes.wintypes import DWORD, WORD, LPCWSTR, LPWSTR, HMODULE, HANDLE, BOOL
 
+class SYSTEMTIME(Structure):
+    _fields_ = [
+        ("wYear", WORD),
+        ("wMonth", WORD),
+        ("wDayOfWeek", WORD),
+        ("wDay", WORD),
+        ("wHour", WORD),
+        ("wMinute", WORD),
+        ("wSecond", WORD),
+        ("wMilliseconds", WORD)
+    ]
+
+# Inclusive valid range of each SYSTEMTIME field, in declaration order
+SYSTEMTIME_MIN = (2020, 1, 0, 1, 0, 0, 0, 0)
+SYSTEMTIME_MAX = (30827, 12, 6, 31, 23, 59, 59, 999)
+
+# VirtualAlloc / VirtualFree flags
+MEM_COMMIT = 0x1000
+MEM_RESERVE = 0x2000
+MEM_RELEASE = 0x8000
+PAGE_READWRITE = 0x04
+PAGE_SIZE = 4096
+
+# kernel32 prototypes bound by TestWindowsAPI.setUpClass: name -> (argtypes, restype)
+KERNEL32_PROTOTYPES = {
+    'GetModuleHandleW': ([LPCWSTR], HMODULE),
+    'GetCurrentProcessId': ([], DWORD),
+    'GetCurrentThreadId': ([], DWORD),
+    'GetTickCount': ([], DWORD),
+    'GetLocalTime': ([POINTER(SYSTEMTIME)], None),
+    'VirtualAlloc': ([c_void_p, c_size_t, DWORD, DWORD], c_void_p),
+    'VirtualFree': ([c_void_p, c_size_t, DWORD], c_int32),
+    'GetEnvironmentVariableW': ([LPCWSTR, LPWSTR, DWORD], DWORD),
+    'GetComputerNameW': ([LPWSTR, POINTER(DWORD)], BOOL),
+}
+
 @unittest.skipUnless(sys.platform == 'win32', "Windows only")
 class TestWindowsAPI(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.kernel32 = WinDLL('kernel32')
         cls.user32 = WinDLL('user32')
+
+        # Bind every prototype once; tests call the shared function objects
+        for name, (argtypes, restype) in KERNEL32_PROTOTYPES.items():
+            fn = getattr(cls.kernel32, name)
+            fn.argtypes = argtypes
+            fn.restype = restype
+            setattr(cls, name, fn)
+
+        # Output buffer shared by the wide-string tests; each test resets
+        # the first WCHAR instead of allocating (and zeroing) a new one
+        cls.wbuf = create_unicode_buffer(1024)
     
     def test_get_set_last_error(self):
         """Test GetLastError / SetLastError"""
@@ -36,121 +84,84 @@ class TestWindowsAPI(unittest.TestCase):
     
     def test_get_module_handle(self):
         """Test GetModuleHandleW"""
-        GetModuleHandleW = self.kernel32.GetModuleHandleW
-        GetModuleHandleW.argtypes = [LPCWSTR]
-        GetModuleHandleW.restype = HMODULE
-        
-        handle = GetModuleHandleW('kernel32.dll')
-        self.assertNotEqual(handle, 0, 'Module handle should not be null')
+        handle = self.GetModuleHandleW('kernel32.dll')
+        self.assertTrue(handle, 'Module handle should not be null')
     
     def test_get_module_handle_nonexistent(self):
         """Test GetModuleHandleW for non-existent module"""
-        GetModuleHandleW = self.kernel32.GetModuleHandleW
-        GetModuleHandleW.argtypes = [LPCWSTR]
-        GetModuleHandleW.restype = HMODULE
-        # Clear any errcheck from global scope
-        if hasattr(GetModuleHandleW, 'errcheck'):
-            del GetModuleHandleW.errcheck
-        
-        handle = GetModuleHandleW('NonExistentModule99999.dll')
+        handle = self.GetModuleHandleW('NonExistentModule99999.dll')
         self.assertIsNone(handle, 'Should return None for non-existent module')
     
     def test_get_current_process_id(self):
         """Test GetCurrentProcessId"""
-        GetCurrentProcessId = self.kernel32.GetCurrentProcessId
-        GetCurrentProcessId.argtypes = []
-        GetCurrentProcessId.restype = DWORD
-        
-        pid = GetCurrentProcessId()
+        pid = self.GetCurrentProcessId()
         self.assertGreater(pid, 0, 'Process ID should be positive')
     
     def test_get_current_thread_id(self):
         """Test GetCurrentThreadId"""
-        GetCurrentThreadId = self.kernel32.GetCurrentThreadId
-        GetCurrentThreadId.argtypes = []
-        GetCurrentThreadId.restype = DWORD
-        
-        tid = GetCurrentThreadId()
+        tid = self.GetCurrentThreadId()
         self.assertGreater(tid, 0, 'Thread ID should be positive')
     
     def test_get_tick_count(self):
         """Test GetTickCount"""
-        GetTickCount = self.kernel32.GetTickCount
-        GetTickCount.argtypes = []
-        GetTickCount.restype = DWORD
-        
-        tick1 = GetTickCount()
+        tick1 = self.GetTickCount()
         self.assertGreater(tick1, 0, 'Tick count should be positive')
         
         # Wait a bit
         import time
         time.sleep(0.05)
         
-        tick2 = GetTickCount()
+        tick2 = self.GetTickCount()
         self.assertGreaterEqual(tick2, tick1, 'Tick count should increase')
     
     def test_systemtime_structure(self):
         """Test SYSTEMTIME structure with GetLocalTime"""
-        class SYSTEMTIME(Structure):
-            _fields_ = [
-                ("wYear", WORD),
-                ("wMonth", WORD),
-                ("wDayOfWeek", WORD),
-                ("wDay", WORD),
-                ("wHour", WORD),
-                ("wMinute", WORD),
-                ("wSecond", WORD),
-                ("wMilliseconds", WORD)
-            ]
-        
-        GetLocalTime = self.kernel32.GetLocalTime
-        GetLocalTime.argtypes = [POINTER(SYSTEMTIME)]
-        GetLocalTime.restype = None
-        
+        # Eight WORDs and nothing else: the fixed Win32 layout has no padding
+        self.assertEqual(sizeof(SYSTEMTIME), 8 * sizeof(WORD))
+
         st = SYSTEMTIME()
-        GetLocalTime(byref(st))
-        
-        self.assertGreaterEqual(st.wYear, 2020, 'Year should be reasonable')
-        self.assertGreaterEqual(st.wMonth, 1)
-        self.assertLessEqual(st.wMonth, 12, 'Month should be 1-12')
-        self.assertGreaterEqual(st.wDay, 1)
-        self.assertLessEqual(st.wDay, 31, 'Day should be 1-31')
-        self.assertGreaterEqual(st.wHour, 0)
-        self.assertLess(st.wHour, 24, 'Hour should be 0-23')
-        self.assertGreaterEqual(st.wMinute, 0)
-        self.assertLess(st.wMinute, 60, 'Minute should be 0-59')
-        self.assertGreaterEqual(st.wSecond, 0)
-        self.assertLess(st.wSecond, 60, 'Second should be 0-59')
+        self.GetLocalTime(byref(st))
+        
+        # Read all eight WORDs at once through the buffer protocol
+        words = memoryview(st).cast('B').cast('H')
+        out_of_range = [
+            (name, value)
+            for (name, _), value, lo, hi in zip(
+                SYSTEMTIME._fields_, words, SYSTEMTIME_MIN, SYSTEMTIME_MAX
+            )
+            if not lo <= value <= hi
+        ]
+        self.assertEqual(out_of_range, [], 'SYSTEMTIME fields out of range')
+        self.assertEqual(words[0], st.wYear)
     
     def test_virtual_alloc_free(self):
         """Test VirtualAlloc/VirtualFree"""
-        VirtualAlloc = self.kernel32.VirtualAlloc
-        VirtualAlloc.argtypes = [c_void_p, c_size_t, DWORD, DWORD]
-        VirtualAlloc.restype = c_void_p
-        
-        VirtualFree = self.kernel32.VirtualFree
-        VirtualFree.argtypes = [c_void_p, c_size_t, DWORD]
-        VirtualFree.restype = c_int32
+        ptr = self.VirtualAlloc(None, PAGE_SIZE, MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE)
+        self.assertTrue(ptr, 'VirtualAlloc should succeed')
         
-        MEM_COMMIT = 0x1000
-        MEM_RESERVE = 0x2000
-        MEM_RELEASE = 0x8000
-        PAGE_READWRITE = 0x04
-        
-        ptr = VirtualAlloc(None, 4096, MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE)
-        self.assertNotEqual(ptr, 0, 'VirtualAlloc should succeed')
-        
-        result = VirtualFree(ptr, 0, MEM_RELEASE)
+        result = self.VirtualFree(ptr, 0, MEM_RELEASE)
+        self.assertNotEqual(result, 0, 'VirtualFree should succeed')
+
+    def test_virtual_alloc_bulk(self):
+        """Test one VirtualAlloc region covering many pages"""
+        pages = 16
+        size = PAGE_SIZE * pages
+        ptr = self.VirtualAlloc(None, size, MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE)
+        self.assertTrue(ptr, 'VirtualAlloc should succeed')
+        try:
+            # Committed pages start zeroed; fill and check them all at once
+            self.assertEqual(string_at(ptr, size), bytes(size))
+            memset(ptr, 0xAA, size)
+            self.assertEqual(string_at(ptr, size), b'\xaa' * size)
+        finally:
+            result = self.VirtualFree(ptr, 0, MEM_RELEASE)
         self.assertNotEqual(result, 0, 'VirtualFree should succeed')
     
     def test_wide_strings(self):
         """Test wide string parameters"""
-        GetEnvironmentVariableW = self.kernel32.GetEnvironmentVariableW
-        GetEnvironmentVariableW.argtypes = [LPCWSTR, LPWSTR, DWORD]
-        GetEnvironmentVariableW.restype = DWORD
-        
-        buf = create_unicode_buffer(1024)
-        length = GetEnvironmentVariableW('TEMP', buf, 1024)
+        buf = self.wbuf
+        buf[0] = '\0'
+        length = self.GetEnvironmentVariableW('TEMP', buf, len(buf))
         
         self.assertGreater(length, 0, 'Should find TEMP environment variable')
         self.assertGreater(len(buf.value), 0, 'TEMP should not be empty')
@@ -158,20 +169,19 @@ class TestWindowsAPI(unittest.TestCase):
     
     def test_get_computer_name(self):
         """Test GetComputerNameW"""
-        GetComputerNameW = self.kernel32.GetComputerNameW
-        GetComputerNameW.argtypes = [LPWSTR, POINTER(DWORD)]
-        GetComputerNameW.restype = BOOL
-        
-        buf = create_unicode_buffer(256)
-        size = DWORD(256)
+        buf = self.wbuf
+        buf[0] = '\0'
+        size = DWORD(len(buf))
         
-        result = GetComputerNameW(buf, byref(size))
+        result = self.GetComputerNameW(buf, byref(size))
         self.assertNotEqual(result, 0, 'GetComputerNameW should succeed')
         self.assertGreater(len(buf.value), 0, 'Computer name should not be empty')
     
     def test_errcheck_with_windows_api(self):
         """Test errcheck with Windows API"""
-        GetModuleHandleW = self.kernel32.GetModuleHandleW
+        # Item access returns a fresh function object, so the errcheck below
+        # never leaks onto the shared self.GetModuleHandleW
+        GetModuleHandleW = self.kernel32['GetModuleHandleW']
         GetModuleHandleW.argtypes = [LPCWSTR]
         GetModuleHandleW.restype = HMODULE
         
@@ -187,7 +197,7 @@ class TestWindowsAPI(unittest.TestCase):
         
         handle = GetModuleHandleW('kernel32.dll')
         self.assertTrue(errcheck_called, 'errcheck should have been called')
-        self.assertNotEqual(handle, 0, 'Should return valid handle')
+        self.assertTrue(handle, 'Should return valid handle')
         
         # This should raise WinError
         with self.assertRaises(OSError):